@@ -0,0 +1,96 @@
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+# Runs in a fresh interpreter. Times imports, config/client setup and one
+# strategy pass up to the moment the first order is signed and handed to the
+# transport. The transport is replaced so nothing goes over the network.
+CHILD = r"""
+import time
+t0 = time.perf_counter()
+import json, sys
+mode = sys.argv[1]
+
+from kalshi_bot import registry
+from kalshi_bot.config import load_config, make_http_client
+from kalshi_bot.risk import RiskManager
+from kalshi_bot.execution import ExecutionEngine
+if mode == "stream":
+    import websockets
+    from kalshi_bot.client import KalshiWebSocketClient
+t_import = time.perf_counter()
+
+first_order = []
+config = load_config()
+client = make_http_client(config)
+def post(path, body, timeout=None):
+    client.request_headers("POST", path)
+    first_order.append(time.perf_counter())
+    return {"order": dict(body, order_id="bench", status="resting")}
+client.post = post
+
+if mode == "stream":
+    ws = KalshiWebSocketClient(client.key_id, client.private_key, config.environment)
+    ws.request_headers("GET", ws.url_suffix)
+
+strat = registry.build("market_maker", spread=4, size=1)
+engine = ExecutionEngine(client, "BENCH", RiskManager())
+book = {"yes": {"bids": [[40, 10]], "asks": [[44, 10]]}, "no": {"bids": [], "asks": []}}
+engine.execute(strat.on_book(book, {}, {}))
+
+print(json.dumps({
+    "import_ms": (t_import - t0) * 1000,
+    "first_order_ms": (first_order[0] - t0) * 1000,
+}))
+"""
+
+
+def run(mode, env):
+    t0 = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, mode],
+        env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    wall = (time.perf_counter() - t0) * 1000
+    res = json.loads(out.strip().splitlines()[-1])
+    res["process_ms"] = wall
+    return res
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    with tempfile.NamedTemporaryFile("wb", suffix=".pem", delete=False) as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ))
+        key_path = f.name
+
+    env = dict(os.environ, KALSHI_API_KEY_ID="bench", KALSHI_PRIVATE_KEY_PATH=key_path,
+               PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+    try:
+        for mode in ("rest", "stream"):
+            runs = [run(mode, env) for _ in range(args.runs)]
+            med = {k: statistics.median(r[k] for r in runs) for k in runs[0]}
+            print(f"{mode:6s}  import {med['import_ms']:7.1f} ms  "
+                  f"import->first order {med['first_order_ms']:7.1f} ms  "
+                  f"process wall {med['process_ms']:7.1f} ms  (median of {args.runs})")
+    finally:
+        os.unlink(key_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import os
+import time
+import random
+import argparse
+from functools import partial
+
+from kalshi_bot.parallel import StrategyPool
+from kalshi_bot.strats.market_maker import MarketMaker
+
+
+class HeavyMarketMaker(MarketMaker):
+    """MarketMaker plus a fixed chunk of CPU work per call, standing in for a heavier model."""
+
+    def __init__(self, work=20000, **kw):
+        super().__init__(**kw)
+        self.work = work
+
+    def on_book(self, orderbook, positions, account):
+        acc = 0
+        for i in range(self.work):
+            acc += i * i
+        return super().on_book(orderbook, positions, account)
+
+
+def make_strat(work, ticker):
+    return HeavyMarketMaker(work=work)
+
+
+def random_book(levels=10):
+    bid = random.randint(10, 80)
+    ask = bid + random.randint(1, 5)
+    return {
+        "yes": {
+            "bids": [[bid - i, random.randint(1, 50)] for i in range(levels)],
+            "asks": [[ask + i, random.randint(1, 50)] for i in range(levels)],
+        },
+        "no": {"bids": [], "asks": []},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickers", type=int, default=64)
+    parser.add_argument("--cycles", type=int, default=50)
+    parser.add_argument("--work", type=int, default=20000, help="Loop iterations per on_book call")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    tickers = [f"BENCH-{i:04d}" for i in range(args.tickers)]
+    books = {t: random_book() for t in tickers}
+
+    base = None
+    for workers in range(1, args.max_workers + 1):
+        with StrategyPool(partial(make_strat, args.work), tickers, workers=workers) as pool:
+            pool.step(books, {}, {})  # warm up workers
+            t0 = time.perf_counter()
+            for _ in range(args.cycles):
+                intents = pool.step(books, {}, {})
+            elapsed = time.perf_counter() - t0
+        rate = args.cycles * len(tickers) / elapsed
+        base = base or rate
+        print(f"workers={workers:2d}  {rate:10.0f} on_book/s  "
+              f"{elapsed / args.cycles * 1000:7.2f} ms/cycle  speedup={rate / base:4.2f}x  "
+              f"intents/cycle={len(intents)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import time
+
+_UNSEEN = object()  # no fill poll observed yet
+
+
+class AccountCache:
+    """
+    TTL cache in front of KalshiHttpClient.get_balance / list_positions.
+
+    Balance and positions only move when we trade, so entries are served from
+    memory until they expire or one of our own order acks / fills invalidates
+    them. Hook on_order into OrderManager.listeners, and feed fill polls to
+    check_fills (or fill stream events to on_fill). A fill poll only pays off
+    while the cache is fresh(); once it has expired the refetch sees the fills.
+    """
+
+    def __init__(self, client, ttl=5.0):
+        self.client = client
+        self.ttl = ttl
+        self._entries = {}  # name -> (fetched_at, value)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.last_trade_id = _UNSEEN
+
+    def balance(self):
+        return self._get("balance", self.client.get_balance)
+
+    def positions(self):
+        return self._get("positions", self.client.list_positions)
+
+    def fresh(self):
+        """True if balance and positions would both be served from memory."""
+        now = time.monotonic()
+        return all(
+            name in self._entries and now - self._entries[name][0] < self.ttl
+            for name in ("balance", "positions")
+        )
+
+    def invalidate(self):
+        self._entries.clear()
+        self.invalidations += 1
+
+    def on_order(self, order):
+        """Order ack callback: resting buys tie up balance, fills move positions."""
+        self.invalidate()
+
+    def on_fill(self, fill):
+        self.invalidate()
+
+    def check_fills(self, fills):
+        """
+        Feed a list_fills response (newest first); invalidates on a trade_id
+        we haven't seen. The first call only records the latest fill.
+        """
+        rows = fills.get("fills", [])
+        latest = rows[0].get("trade_id") if rows else None
+        if latest == self.last_trade_id:
+            return False
+        first = self.last_trade_id is _UNSEEN
+        self.last_trade_id = latest
+        if first:
+            return False
+        self.on_fill(rows[0] if rows else None)
+        return True
+
+    def snapshot(self):
+        """Cached values by name, for checkpointing."""
+        return {name: value for name, (_, value) in self._entries.items()}
+
+    def restore(self, values):
+        """Seed the cache (e.g. from a checkpoint); entries count as freshly fetched."""
+        now = time.monotonic()
+        for name, value in values.items():
+            self._entries[name] = (now, value)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def _get(self, name, fetch):
+        entry = self._entries.get(name)
+        now = time.monotonic()
+        if entry is not None and now - entry[0] < self.ttl:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        value = fetch()
+        self._entries[name] = (time.monotonic(), value)
+        return value
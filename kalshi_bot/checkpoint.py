@@ -0,0 +1,63 @@
+import os
+import pickle
+import time
+import zlib
+
+VERSION = 3
+
+
+def save(path, state: dict) -> int:
+    """
+    Write state as a zlib-compressed pickle. The file is replaced atomically,
+    so a crash mid-write leaves the previous checkpoint intact. Returns bytes written.
+    """
+    blob = zlib.compress(pickle.dumps({"version": VERSION, **state}, protocol=pickle.HIGHEST_PROTOCOL))
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(blob)
+    os.replace(tmp, path)
+    return len(blob)
+
+
+def load(path) -> dict | None:
+    """Read a checkpoint; None if it is missing, unreadable or from another version."""
+    try:
+        with open(path, "rb") as f:
+            state = pickle.loads(zlib.decompress(f.read()))
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"[checkpoint] ignoring unreadable {path}: {type(e).__name__}: {e}")
+        return None
+    if state.get("version") != VERSION:
+        print(f"[checkpoint] ignoring {path}: version {state.get('version')} != {VERSION}")
+        return None
+    return state
+
+
+class Checkpointer:
+    """Saves at most every `interval` seconds; call maybe_save() from the loop."""
+
+    def __init__(self, path, interval=30.0):
+        self.path = path
+        self.interval = interval
+        self.last = time.monotonic()
+        self.saves = 0
+
+    def maybe_save(self, build_state):
+        """build_state() is only called when a save is due."""
+        if time.monotonic() - self.last < self.interval:
+            return False
+        self.save(build_state())
+        return True
+
+    def save(self, state):
+        try:
+            save(self.path, state)
+            self.saves += 1
+        except Exception as e:
+            print(f"[checkpoint] save failed: {type(e).__name__}: {e}")
+        self.last = time.monotonic()
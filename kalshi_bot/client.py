@@ -1,23 +1,17 @@
 import requests
 import base64
 import time
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 from datetime import datetime, timedelta
 from enum import Enum
 import json
 
 from requests.exceptions import HTTPError
 
-from cryptography.hazmat.primitives import serialization, hashes
-from cryptography.hazmat.primitives.asymmetric import padding, rsa
-from cryptography.exceptions import InvalidSignature
-
-import websockets
-
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
+# cryptography and websockets are imported where they are first used, so
+# importing the client (e.g. for REST-only tools) doesn't pay for them
+if TYPE_CHECKING:
+    from cryptography.hazmat.primitives.asymmetric import rsa
 
 
 class Environment(Enum):
@@ -29,7 +23,7 @@ class KalshiBaseClient:
     def __init__(
         self,
         key_id: str,
-        private_key: rsa.RSAPrivateKey,
+        private_key: "rsa.RSAPrivateKey",
         environment: Environment = Environment.DEMO,
     ):
         """Initializes the client with the provided API key and private key.
@@ -43,6 +37,8 @@ class KalshiBaseClient:
         self.private_key = private_key
         self.environment = environment
         self.last_api_call = datetime.now()
+        self._pss = None
+        self.clock = None  # optional timesync.ClockSync for exchange-time stamps
 
         if self.environment == Environment.DEMO:
             self.HTTP_BASE_URL = "https://demo-api.kalshi.co"
@@ -55,7 +51,10 @@ class KalshiBaseClient:
 
     def request_headers(self, method: str, path: str) -> Dict[str, Any]:
         """Generates the required authentication headers for API requests."""
-        current_time_milliseconds = int(time.time() * 1000)
+        if self.clock is not None:
+            current_time_milliseconds = self.clock.now_ms()
+        else:
+            current_time_milliseconds = int(time.time() * 1000)
         timestamp_str = str(current_time_milliseconds)
 
         # Remove query params from path
@@ -78,14 +77,20 @@ class KalshiBaseClient:
 
     def sign_pss_text(self, text: str) -> str:
         """Signs the text using RSA-PSS and returns the base64 encoded signature."""
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import padding
+        from cryptography.exceptions import InvalidSignature
+
+        if self._pss is None:
+            self._pss = padding.PSS(
+                mgf=padding.MGF1(hashes.SHA256()),
+                salt_length=padding.PSS.DIGEST_LENGTH
+            )
         message = text.encode('utf-8')
         try:
             signature = self.private_key.sign(
                 message,
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.DIGEST_LENGTH
-                ),
+                self._pss,
                 hashes.SHA256()
             )
             return base64.b64encode(signature).decode('utf-8')
@@ -97,7 +102,7 @@ class KalshiHttpClient(KalshiBaseClient):
     def __init__(
         self,
         key_id: str,
-        private_key: rsa.RSAPrivateKey,
+        private_key: "rsa.RSAPrivateKey",
         environment: Environment = Environment.DEMO,
     ):
         super().__init__(key_id, private_key, environment)
@@ -116,41 +121,55 @@ class KalshiHttpClient(KalshiBaseClient):
             time.sleep(threshold_in_seconds)
         self.last_api_call = datetime.now()
 
+    def observe_clock(self, response: requests.Response, sent: float) -> None:
+        """Feeds the response Date header into the clock offset estimate."""
+        if self.clock is not None:
+            self.clock.observe_http(response, sent, time.time())
+
     def raise_if_bad_response(self, response: requests.Response) -> None:
         """Raises an HTTPError if the response status code indicates an error."""
         if response.status_code not in range(200, 299):
             response.raise_for_status()
 
-    def post(self, path: str, body: dict) -> Any:
+    def post(self, path: str, body: dict, timeout: Optional[float] = None) -> Any:
         """Performs an authenticated POST request to the Kalshi API."""
         self.rate_limit()
+        sent = time.time()
         response = requests.post(
             self.host + path,
             json=body,
-            headers=self.request_headers("POST", path)
+            headers=self.request_headers("POST", path),
+            timeout=timeout
         )
+        self.observe_clock(response, sent)
         self.raise_if_bad_response(response)
         return response.json()
 
-    def get(self, path: str, params: Dict[str, Any] = {}) -> Any:
+    def get(self, path: str, params: Dict[str, Any] = {}, timeout: Optional[float] = None) -> Any:
         """Performs an authenticated GET request to the Kalshi API."""
         self.rate_limit()
+        sent = time.time()
         response = requests.get(
             self.host + path,
             headers=self.request_headers("GET", path),
-            params=params
+            params=params,
+            timeout=timeout
         )
+        self.observe_clock(response, sent)
         self.raise_if_bad_response(response)
         return response.json()
 
-    def delete(self, path: str, params: Dict[str, Any] = {}) -> Any:
+    def delete(self, path: str, params: Dict[str, Any] = {}, timeout: Optional[float] = None) -> Any:
         """Performs an authenticated DELETE request to the Kalshi API."""
         self.rate_limit()
+        sent = time.time()
         response = requests.delete(
             self.host + path,
             headers=self.request_headers("DELETE", path),
-            params=params
+            params=params,
+            timeout=timeout
         )
+        self.observe_clock(response, sent)
         self.raise_if_bad_response(response)
         return response.json()
 
@@ -162,6 +181,10 @@ class KalshiHttpClient(KalshiBaseClient):
         """Retrieves the exchange status."""
         return self.get(self.exchange_url + "/status")
 
+    def get_market(self, ticker: str) -> Dict[str, Any]:
+        """Retrieves a single market (status, open/close times, ...)."""
+        return self.get(self.markets_url + f'/{ticker}')
+
     def get_trades(
         self,
         ticker: Optional[str] = None,
@@ -182,25 +205,34 @@ class KalshiHttpClient(KalshiBaseClient):
         params = {k: v for k, v in params.items() if v is not None}
         return self.get(self.markets_url + '/trades', params=params)
     
-    def place_order(self, payload: dict):
+    def get_orderbook(self, ticker: str, depth: Optional[int] = None) -> Dict[str, Any]:
+        """Retrieves the orderbook for a market."""
+        params = {'depth': depth} if depth is not None else {}
+        return self.get(self.markets_url + f'/{ticker}/orderbook', params=params)
+
+    def place_order(self, payload: dict, timeout: Optional[float] = None):
         """Place an order (buy/sell contracts)."""
-        return self.post("/trade-api/v2/portfolio/orders", body=payload)
+        return self.post("/trade-api/v2/portfolio/orders", body=payload, timeout=timeout)
 
-    def cancel_order(self, order_id: str):
+    def cancel_order(self, order_id: str, timeout: Optional[float] = None):
         """Cancel an order by ID."""
-        return self.delete(self.portfolio_url + f"/orders/{order_id}")
+        return self.delete(self.portfolio_url + f"/orders/{order_id}", timeout=timeout)
+
+    def get_order(self, order_id: str, timeout: Optional[float] = None):
+        """Get a single order by ID."""
+        return self.get(self.portfolio_url + f"/orders/{order_id}", timeout=timeout)
 
-    def list_orders(self, params: dict = None):
+    def list_orders(self, params: dict = None, timeout: Optional[float] = None):
         """List orders (open/closed)."""
-        return self.get(self.portfolio_url + "/orders", params=params or {})
+        return self.get(self.portfolio_url + "/orders", params=params or {}, timeout=timeout)
 
     def list_positions(self):
         """List open positions."""
         return self.get(self.portfolio_url + "/positions")
 
-    def list_fills(self):
+    def list_fills(self, params: dict = None):
         """List fills (executed trades)."""
-        return self.get(self.portfolio_url + "/fills")
+        return self.get(self.portfolio_url + "/fills", params=params or {})
 
 
 class KalshiWebSocketClient(KalshiBaseClient):
@@ -208,16 +240,25 @@ class KalshiWebSocketClient(KalshiBaseClient):
     def __init__(
         self,
         key_id: str,
-        private_key: rsa.RSAPrivateKey,
+        private_key: "rsa.RSAPrivateKey",
         environment: Environment = Environment.DEMO,
+        tickers: Optional[List[str]] = None,
+        channels: Optional[List[str]] = None,
     ):
         super().__init__(key_id, private_key, environment)
         self.ws = None
         self.url_suffix = "/trade-api/ws/v2"
         self.message_id = 1  # Add counter for message IDs
+        # subclasses that json-decode in on_message set this and call
+        # observe_event themselves, so messages aren't decoded twice
+        self.decodes_messages = False
+        self.tickers = list(tickers) if tickers else None  # None = all markets
+        self.channels = list(channels) if channels else ["ticker"]
 
     async def connect(self):
         """Establishes a WebSocket connection using authentication."""
+        import websockets
+
         host = self.WS_BASE_URL + self.url_suffix
         auth_headers = self.request_headers("GET", self.url_suffix)
         async with websockets.connect(host, additional_headers=auth_headers) as websocket:
@@ -231,27 +272,47 @@ class KalshiWebSocketClient(KalshiBaseClient):
         await self.subscribe_to_tickers()
 
     async def subscribe_to_tickers(self):
-        """Subscribe to ticker updates for all markets."""
+        """Subscribe to self.channels for self.tickers (all markets if unset)."""
+        params = {"channels": self.channels}
+        if self.tickers:
+            params["market_tickers"] = self.tickers
         subscription_message = {
             "id": self.message_id,
             "cmd": "subscribe",
-            "params": {
-                "channels": ["ticker"]
-            }
+            "params": params
         }
         await self.ws.send(json.dumps(subscription_message))
         self.message_id += 1
 
     async def handler(self):
         """Handle incoming messages."""
+        import websockets
+
         try:
             async for message in self.ws:
+                if self.clock is not None and not self.decodes_messages:
+                    self.observe_message(message)
                 await self.on_message(message)
         except websockets.ConnectionClosed as e:
             await self.on_close(e.code, e.reason)
         except Exception as e:
             await self.on_error(e)
 
+    def observe_message(self, message):
+        """Feeds the server timestamp of a raw pushed message into the clock."""
+        try:
+            event = json.loads(message)
+        except ValueError:
+            return
+        self.observe_event(event)
+
+    def observe_event(self, event):
+        """Same as observe_message, for a message that is already decoded."""
+        msg = event.get("msg") if isinstance(event, dict) else None
+        ts = msg.get("ts") if isinstance(msg, dict) else None
+        if isinstance(ts, (int, float)):
+            self.clock.observe_event(ts)
+
     async def on_message(self, message):
         """Callback for handling incoming messages."""
         print("Received message:", message)
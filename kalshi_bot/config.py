@@ -0,0 +1,49 @@
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .client import Environment
+
+
+@dataclass(frozen=True)
+class Config:
+    key_id: str | None
+    private_key_path: str
+    environment: Environment
+
+
+@lru_cache(maxsize=None)
+def load_config(dotenv_path: str | None = None) -> Config:
+    """
+    Read .env (once per process) and the KALSHI_* settings.
+
+    KALSHI_API_KEY_ID, KALSHI_PRIVATE_KEY_PATH (default demo_private.pem),
+    KALSHI_ENV ("demo" or "prod", default demo).
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv(dotenv_path)
+    return Config(
+        key_id=os.getenv("KALSHI_API_KEY_ID"),
+        private_key_path=os.getenv("KALSHI_PRIVATE_KEY_PATH", "demo_private.pem"),
+        environment=Environment(os.getenv("KALSHI_ENV", "demo").lower()),
+    )
+
+
+def load_private_key(path: str):
+    from cryptography.hazmat.primitives import serialization
+
+    with open(path, "rb") as f:
+        return serialization.load_pem_private_key(f.read(), password=None)
+
+
+def make_http_client(config: Config | None = None):
+    """Build an authenticated KalshiHttpClient from the loaded config."""
+    from .client import KalshiHttpClient
+
+    config = config or load_config()
+    return KalshiHttpClient(
+        key_id=config.key_id,
+        private_key=load_private_key(config.private_key_path),
+        environment=config.environment,
+    )
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from types import MappingProxyType
 
 @dataclass
 class BookQuote:
@@ -20,6 +21,21 @@ def parse_orderbook(orderbook: dict) -> BookQuote:
         no_ask=no_asks[0][0] if no_asks else None,
     )
 
+def depth_key(orderbook: dict, levels: int | None = None) -> int:
+    """
+    Cheap fingerprint of the book's levels on both sides: every level, or
+    only the best `levels` per side when given.
+    """
+    def window(side, pairs):
+        if levels is None:
+            return pairs
+        return sorted(pairs, key=lambda p: p[0], reverse=side == "bids")[:levels]
+
+    return hash(tuple(
+        tuple(map(tuple, window(side, orderbook.get(leg, {}).get(side, []))))
+        for leg in ("yes", "no") for side in ("bids", "asks")
+    ))
+
 def mid_price(book: BookQuote) -> float | None:
     if book.yes_bid and book.yes_ask:
         return (book.yes_bid + book.yes_ask) / 2.0
@@ -29,3 +45,21 @@ def mid_price(book: BookQuote) -> float | None:
         return float(book.yes_ask)
     return None
 
+
+class MarketContext:
+    """
+    Read-only view over the live local books for a group of related tickers.
+    Holds a reference to the runner's book store, so lookups always see the
+    current state without copying anything per call.
+    """
+
+    def __init__(self, books: dict, tickers):
+        self.books = MappingProxyType(books)
+        self.tickers = tuple(tickers)
+
+    def book(self, ticker: str) -> dict | None:
+        return self.books.get(ticker)
+
+    def quote(self, ticker: str) -> BookQuote | None:
+        ob = self.books.get(ticker)
+        return parse_orderbook(ob) if ob is not None else None
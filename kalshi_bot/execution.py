@@ -1,40 +1,170 @@
+import uuid
 from dataclasses import dataclass
 
+from .data import parse_orderbook
+from .orders import OrderManager
+
+def _filled(order):
+    """Contracts filled on an order from its explicit fill fields, None if it has none."""
+    if "fill_count" in order:
+        return order["fill_count"]
+    if "taker_fill_count" in order or "maker_fill_count" in order:
+        return order.get("taker_fill_count", 0) + order.get("maker_fill_count", 0)
+    return None
+
 @dataclass
 class OrderIntent:
     action: str   # "BUY" or "SELL"
     side: str     # "YES" or "NO"
     price: int    # in cents
     size: int     # number of contracts
+    ticker: str | None = None  # defaults to the engine's ticker
 
 class ExecutionEngine:
     """
     Turns strategy intents into live orders.
     """
 
-    def __init__(self, client, ticker, risk_mgr):
+    def __init__(self, client, ticker, risk_mgr, order_mgr=None):
         self.client = client
         self.ticker = ticker
         self.risk_mgr = risk_mgr
+        self.order_mgr = order_mgr or OrderManager(client)
+        self.last_errors = 0  # submit failures in the most recent execute/execute_legs
+        self.retry = []  # intents from the last execute() the exchange never took; safe to resend
 
     def execute(self, intents):
+        """
+        Submit intents one by one. Intents on a ticker with an order of
+        unknown state are held back (resending could double it); intents that
+        failed without leaving such an order are kept in .retry.
+        """
+        self.last_errors = 0
+        self.retry = []
         placed_orders = []
+        blocked = {}  # ticker -> unresolved, looked up once per call
         for intent in intents:
             if not self.risk_mgr.allow(intent):
                 continue
-            payload = {
-                "action": intent.action,
-                "ticker": self.ticker,
-                "type": "LIMIT",
-                "time_in_force": "GTC",
-                "side": intent.side,
-                "price": intent.price,
-                "size": intent.size,
-            }
+            if self._working(intent):
+                continue  # already quoted by an open order
+            ticker = intent.ticker or self.ticker
+            if ticker not in blocked:
+                blocked[ticker] = self.order_mgr.unresolved(ticker)
+            if blocked[ticker]:
+                print(f"[execution] {ticker} has an unresolved order; holding {intent.action} {intent.price}")
+                continue
+            payload = self._payload(intent)
             try:
-                res = self.client.place_order(**payload)
+                res = self.order_mgr.submit(payload)
                 placed_orders.append(res)
             except Exception as e:
+                self.last_errors += 1
                 print(f"[execution error] {e}")
+                if payload["client_order_id"] in self.order_mgr.orders:
+                    blocked[ticker] = True  # may be live: don't send anything else on top
+                else:
+                    self.retry.append(intent)
+        return placed_orders
+
+    def execute_legs(self, intents):
+        """
+        Submit a multi-leg package. Every leg must pass risk before any is sent.
+        Legs go out immediate-or-cancel, so none is left resting; if a leg
+        fails or the legs fill unevenly, the excess on the fuller legs is
+        offset at the touch so no leg is left naked. Returns the orders placed,
+        offsets included.
+        """
+        self.last_errors = 0
+        self.retry = []
+        if not all(self.risk_mgr.allow(intent) for intent in intents):
+            return []
+        for ticker in {intent.ticker or self.ticker for intent in intents}:
+            if self.order_mgr.unresolved(ticker):
+                print(f"[execution] {ticker} has an unresolved order; holding the package")
+                return []
+        placed_orders = []
+        legs = []  # (intent, contracts filled or None if the order doesn't say)
+        for intent in intents:
+            payload = self._payload(intent, ioc=True)
+            try:
+                res = self.order_mgr.submit(payload)
+            except Exception as e:
+                self.last_errors += 1
+                print(f"[execution error] leg {payload['ticker']}: {e}, unwinding {len(legs)} legs")
+                break
+            placed_orders.append(res)
+            legs.append((intent, self._leg_fill(res.get("order", {}))))
+
+        # every leg is matched down to the smallest fill (nothing, if one never went out)
+        if len(legs) < len(intents):
+            target = 0
+        elif any(filled is None for _, filled in legs):
+            print("[execution warn] leg fills unknown; package left as is")
+            return placed_orders
+        else:
+            target = min(filled for _, filled in legs)
+        for intent, filled in legs:
+            if filled is None:
+                print(f"[unwind] fill of {intent.ticker} unknown; not offsetting it")
+            elif filled > target:
+                try:
+                    res = self._unwind(intent, filled - target)
+                    if res is not None:
+                        placed_orders.append(res)
+                except Exception as ue:
+                    print(f"[unwind error] {intent.ticker}: {ue}")
         return placed_orders
 
+    def _leg_fill(self, order):
+        """Contracts filled on a leg, asking the exchange if the ack doesn't say."""
+        filled = _filled(order)
+        if filled is None and order.get("order_id"):
+            try:
+                filled = _filled(self.client.get_order(order["order_id"]).get("order", {}))
+            except Exception as e:
+                print(f"[execution warn] fill lookup {order['order_id']}: {e}")
+        return filled
+
+    def _unwind(self, intent, count):
+        """Offset `count` filled contracts of a leg with an IOC order at the current touch."""
+        ticker = intent.ticker or self.ticker
+        if self.risk_mgr.halted:
+            print(f"[unwind] halted; {count} on {ticker} left open")
+            return None
+        action = "SELL" if intent.action == "BUY" else "BUY"
+        side = intent.side.lower()
+        touch = "bid" if action == "SELL" else "ask"
+        price = getattr(parse_orderbook(self.client.get_orderbook(ticker)), f"{side}_{touch}")
+        if price is None:
+            print(f"[unwind] no {side} {touch} on {ticker}; {count} left open")
+            return None
+        offset = OrderIntent(action, intent.side, price, count, ticker=ticker)
+        print(f"[unwind] offsetting {count} on {ticker} at {price}")
+        return self.order_mgr.submit(self._payload(offset, ioc=True))
+
+    def _working(self, intent):
+        """True if an open order already rests at this intent's ticker, side and price."""
+        ticker = intent.ticker or self.ticker
+        action, side = intent.action.lower(), intent.side.lower()
+        return any(
+            o.get("ticker") == ticker and o.get("action") == action
+            and o.get("side") == side and o.get(f"{side}_price") == intent.price
+            for o in self.order_mgr.open_orders().values()
+        )
+
+    def _payload(self, intent, ioc=False):
+        side = intent.side.lower()
+        payload = {
+            "ticker": intent.ticker or self.ticker,
+            "action": intent.action.lower(),
+            "side": side,
+            "count": intent.size,
+            "type": "limit",
+            f"{side}_price": intent.price,
+            "client_order_id": str(uuid.uuid4()),
+        }
+        if ioc:
+            payload["time_in_force"] = "immediate_or_cancel"
+        return payload
+
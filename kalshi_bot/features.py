@@ -0,0 +1,139 @@
+from array import array
+from dataclasses import dataclass
+
+# (leg, side) keys of the four ladders, matching the orderbook dict layout
+SIDES = (("yes", "bids"), ("yes", "asks"), ("no", "bids"), ("no", "asks"))
+
+MAX_PRICE = 100
+
+
+@dataclass
+class Features:
+    yes_bid: int | None          # best YES bid, direct or implied from NO asks
+    yes_ask: int | None          # best YES ask, direct or implied from NO bids
+    implied_yes_bid: int | None  # 100 - best NO ask
+    implied_yes_ask: int | None  # 100 - best NO bid
+    implied_no_bid: int | None   # 100 - best YES ask
+    implied_no_ask: int | None   # 100 - best YES bid
+    bid_depth: int               # YES-side buy quantity in the top N levels
+    ask_depth: int               # YES-side sell quantity in the top N levels
+    imbalance: float | None      # (bid - ask) / (bid + ask) depth, in [-1, 1]
+    microprice: float | None     # depth-weighted YES fair price
+
+
+class _Ladder:
+    """
+    Quantity per price (cents) for one side of one leg, plus the best price
+    and cumulative depth over the top N levels.
+
+    The top-N summary is only recomputed when a change lands inside that
+    window, so deltas deeper in the book cost O(1).
+    """
+
+    def __init__(self, is_bid, levels):
+        self.qty = array("i", [0]) * (MAX_PRICE + 1)
+        self.is_bid = is_bid
+        self.levels = levels
+        self.best = None
+        self.depth = 0
+        self.edge = None  # price of the Nth level, None if fewer than N levels
+        self.dirty = False
+
+    def load(self, pairs):
+        for i in range(MAX_PRICE + 1):
+            self.qty[i] = 0
+        for px, qty in pairs:
+            self.qty[px] = qty
+        self.dirty = True
+
+    def apply(self, price, delta):
+        self.qty[price] = max(0, self.qty[price] + delta)
+        if self.edge is None or (price >= self.edge if self.is_bid else price <= self.edge):
+            self.dirty = True
+
+    def refresh(self):
+        if not self.dirty:
+            return
+        prices = range(MAX_PRICE, -1, -1) if self.is_bid else range(MAX_PRICE + 1)
+        best = edge = None
+        depth = n = 0
+        for px in prices:
+            q = self.qty[px]
+            if q <= 0:
+                continue
+            if best is None:
+                best = px
+            depth += q
+            n += 1
+            if n == self.levels:
+                edge = px
+                break
+        self.best, self.depth, self.edge = best, depth, edge
+        self.dirty = False
+
+
+def _flip(px):
+    return MAX_PRICE - px if px is not None else None
+
+
+class BookFeatures:
+    """
+    Full-depth features for one market's book.
+
+    Seed with load(orderbook), then either load() each new snapshot or
+    apply() individual level deltas; features() only rescans ladders whose
+    top-N window changed.
+    """
+
+    def __init__(self, levels=5):
+        self.levels = levels
+        self.ladders = {
+            (leg, side): _Ladder(side == "bids", levels) for leg, side in SIDES
+        }
+
+    def load(self, orderbook: dict) -> "BookFeatures":
+        for leg, side in SIDES:
+            self.ladders[leg, side].load(orderbook.get(leg, {}).get(side, []))
+        return self
+
+    def apply(self, leg: str, side: str, price: int, delta: int) -> None:
+        self.ladders[leg, side].apply(price, delta)
+
+    def features(self) -> Features:
+        for ladder in self.ladders.values():
+            ladder.refresh()
+        yb = self.ladders["yes", "bids"]
+        ya = self.ladders["yes", "asks"]
+        nb = self.ladders["no", "bids"]
+        na = self.ladders["no", "asks"]
+
+        # a NO ask at p is a YES bid at 100 - p, and vice versa
+        implied_yes_bid = _flip(na.best)
+        implied_yes_ask = _flip(nb.best)
+        bid_candidates = [p for p in (yb.best, implied_yes_bid) if p is not None]
+        ask_candidates = [p for p in (ya.best, implied_yes_ask) if p is not None]
+        yes_bid = max(bid_candidates) if bid_candidates else None
+        yes_ask = min(ask_candidates) if ask_candidates else None
+
+        bid_depth = yb.depth + na.depth
+        ask_depth = ya.depth + nb.depth
+        total = bid_depth + ask_depth
+        imbalance = (bid_depth - ask_depth) / total if total else None
+
+        microprice = None
+        if yes_bid is not None and yes_ask is not None and total:
+            # lean towards the side with less resting size
+            microprice = (yes_bid * ask_depth + yes_ask * bid_depth) / total
+
+        return Features(
+            yes_bid=yes_bid,
+            yes_ask=yes_ask,
+            implied_yes_bid=implied_yes_bid,
+            implied_yes_ask=implied_yes_ask,
+            implied_no_bid=_flip(ya.best),
+            implied_no_ask=_flip(yb.best),
+            bid_depth=bid_depth,
+            ask_depth=ask_depth,
+            imbalance=imbalance,
+            microprice=microprice,
+        )
@@ -0,0 +1,126 @@
+import math
+from array import array
+
+
+class EMA:
+    """Exponential moving average. alpha defaults to 2 / (span + 1)."""
+
+    def __init__(self, span=20, alpha=None):
+        self.alpha = alpha if alpha is not None else 2.0 / (span + 1)
+        self.value = None
+
+    def update(self, x):
+        if self.value is None:
+            self.value = float(x)
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+
+class RingBuffer:
+    """Fixed-size float window backed by a preallocated array."""
+
+    def __init__(self, size):
+        self.size = size
+        self.data = array("d", [0.0]) * size
+        self.idx = 0
+        self.count = 0
+
+    def push(self, x):
+        """Store x, returning the value it evicted (None until the window is full)."""
+        old = self.data[self.idx] if self.count == self.size else None
+        self.data[self.idx] = x
+        self.idx = (self.idx + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+        return old
+
+    def full(self):
+        return self.count == self.size
+
+
+class RollingStats:
+    """Rolling mean and sample variance over the last `window` values."""
+
+    def __init__(self, window):
+        self.buf = RingBuffer(window)
+        self.sum = 0.0
+        self.sumsq = 0.0
+
+    def update(self, x):
+        old = self.buf.push(x)
+        self.sum += x
+        self.sumsq += x * x
+        if old is not None:
+            self.sum -= old
+            self.sumsq -= old * old
+        return self.mean
+
+    @property
+    def mean(self):
+        n = self.buf.count
+        return self.sum / n if n else None
+
+    @property
+    def variance(self):
+        n = self.buf.count
+        if n < 2:
+            return None
+        # running sums can drift slightly negative for a flat window
+        return max(0.0, (self.sumsq - self.sum * self.sum / n) / (n - 1))
+
+    @property
+    def std(self):
+        var = self.variance
+        return math.sqrt(var) if var is not None else None
+
+
+class RollingVWAP:
+    """Volume-weighted average trade price over the last `window` trades."""
+
+    def __init__(self, window):
+        self.notional = RingBuffer(window)
+        self.volume = RingBuffer(window)
+        self.notional_sum = 0.0
+        self.volume_sum = 0.0
+
+    def update(self, price, qty):
+        old_n = self.notional.push(price * qty)
+        old_v = self.volume.push(qty)
+        self.notional_sum += price * qty
+        self.volume_sum += qty
+        if old_n is not None:
+            self.notional_sum -= old_n
+            self.volume_sum -= old_v
+        return self.value
+
+    @property
+    def value(self):
+        return self.notional_sum / self.volume_sum if self.volume_sum > 0 else None
+
+
+class RealizedVol:
+    """Root sum of squared log returns over the last `window` price changes."""
+
+    def __init__(self, window):
+        self.sq_returns = RingBuffer(window)
+        self.sum = 0.0
+        self.last = None
+
+    def update(self, price):
+        if price <= 0:
+            return self.value
+        if self.last is not None:
+            r = math.log(price / self.last)
+            old = self.sq_returns.push(r * r)
+            self.sum += r * r
+            if old is not None:
+                self.sum -= old
+        self.last = price
+        return self.value
+
+    @property
+    def value(self):
+        if self.sq_returns.count == 0:
+            return None
+        return math.sqrt(max(0.0, self.sum))
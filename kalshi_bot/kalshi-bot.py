@@ -1,9 +1,11 @@
 import os
 import time
 import math
+import uuid
 import json
 import backoff
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Optional, Dict, Any, Tuple, List
 from dotenv import load_dotenv
@@ -23,9 +25,21 @@ INVENTORY_CAP = int(os.getenv("INVENTORY_CAP", "20"))              # max net YES
 PNL_STOP_CENTS = int(os.getenv("PNL_STOP_CENTS", "-3000"))         # stop if PnL < -$30
 MIN_BOOK_DEPTH = int(os.getenv("MIN_BOOK_DEPTH", "1"))             # require at least depth
 POLL_SEC = float(os.getenv("POLL_SEC", "2.0"))                     # polling cadence (no WS here)
+ORDER_TIMEOUT_SEC = float(os.getenv("ORDER_TIMEOUT_SEC", "1.5"))   # per-attempt order POST timeout
+ORDER_ATTEMPTS = int(os.getenv("ORDER_ATTEMPTS", "3"))             # same-ID resends before giving up
+ORDER_LOOKBACK_SEC = int(os.getenv("ORDER_LOOKBACK_SEC", "60"))    # order lookup window; covers local clock skew
 
 # ---- HTTP client with session + retry/backoff ----
 
+class UnresolvedOrder(RuntimeError):
+    """An order POST we never got an answer for; it may or may not be live."""
+
+    def __init__(self, client_order_id: str, ticker: str, since_ts: int):
+        super().__init__(f"order {client_order_id} unresolved after {ORDER_ATTEMPTS} attempts")
+        self.client_order_id = client_order_id
+        self.ticker = ticker
+        self.since_ts = since_ts
+
 class KalshiClient:
     def __init__(self, base_url: str, email: Optional[str] = None, password: Optional[str] = None):
         self.base_url = base_url.rstrip("/")
@@ -36,12 +50,17 @@ class KalshiClient:
 
     @backoff.on_exception(backoff.expo, (requests.RequestException,), max_time=60)
     def _req(self, method: str, path: str, **kw) -> Dict[str, Any]:
+        # retried blindly: only for requests that are safe to repeat.
+        # Order placement goes through place_order's ID-keyed retry instead.
+        return self._send(method, path, **kw)
+
+    def _send(self, method: str, path: str, timeout: float = 15, **kw) -> Dict[str, Any]:
         url = f"{self.base_url}{path}"
-        r = self.s.request(method, url, timeout=15, **kw)
+        r = self.s.request(method, url, timeout=timeout, **kw)
         if r.status_code == 401:
             # attempt re-login once
             self.login()
-            r = self.s.request(method, url, timeout=15, **kw)
+            r = self.s.request(method, url, timeout=timeout, **kw)
         r.raise_for_status()
         if r.text.strip() == "":
             return {}
@@ -87,9 +106,38 @@ class KalshiClient:
             "time_in_force": tif, # "GTC", "IOC", etc. (GTC safest here)
             "side": side,         # "YES" or "NO"
             "price": price,       # in cents (0..100)
-            "size": size
+            "size": size,
+            "client_order_id": str(uuid.uuid4()),
         }
-        return self._req("POST", "/orders", json=payload)
+        # Never blind-retry a POST: after a timeout the order may be live.
+        # Resend with the same client_order_id (the exchange rejects a
+        # duplicate with 409) and look the order up by that ID in between.
+        # min_ts is compared against exchange time; our clock may be off by seconds
+        since_ts = int(time.time()) - ORDER_LOOKBACK_SEC
+        for _ in range(ORDER_ATTEMPTS):
+            try:
+                return self._send("POST", "/orders", json=payload, timeout=ORDER_TIMEOUT_SEC)
+            except (requests.Timeout, requests.ConnectionError) as e:
+                print(f"[order timeout] {payload['client_order_id']}: {type(e).__name__}, reconciling")
+            except requests.HTTPError as e:
+                if e.response is None or e.response.status_code != 409:
+                    raise
+            found = self.find_order(ticker, payload["client_order_id"], since_ts)
+            if found is not None:
+                return {"order": found}
+        raise UnresolvedOrder(payload["client_order_id"], ticker, since_ts)
+
+    def find_order(self, ticker: str, client_order_id: str, since_ts: int) -> Optional[Dict[str, Any]]:
+        try:
+            res = self._send("GET", "/orders", params={"ticker": ticker, "min_ts": since_ts},
+                             timeout=ORDER_TIMEOUT_SEC)
+        except requests.RequestException as e:
+            print(f"[reconcile warn] {client_order_id}: {e}")
+            return None
+        for o in res.get("orders", []):
+            if o.get("client_order_id") == client_order_id:
+                return o
+        return None
 
     def cancel_order(self, order_id: str) -> Dict[str, Any]:
         return self._req("DELETE", f"/orders/{order_id}")
@@ -160,6 +208,31 @@ def choose_quotes(quote: BookQuote, spread_cents: int) -> Tuple[Optional[int], O
         buy_price = max(1, sell_price - 1)
     return buy_price, sell_price
 
+def _try_cancel(client):
+    def cancel(item: Tuple[str, Dict[str, Any]]) -> Optional[Exception]:
+        key, order = item
+        try:
+            if order.get("status") == "unknown":
+                # never acknowledged: find it by client_order_id first
+                found = client.find_order(order["ticker"], key, order["since_ts"])
+                if found is None or not found.get("order_id"):
+                    return None
+                key = found["order_id"]
+            client.cancel_order(key)
+            return None
+        except Exception as e:
+            return e
+    return cancel
+
+def _track_unresolved(my_orders: Dict[str, Dict[str, Any]], e: UnresolvedOrder) -> None:
+    # keyed by client_order_id until we learn the exchange order_id
+    my_orders[e.client_order_id] = {
+        "client_order_id": e.client_order_id,
+        "ticker": e.ticker,
+        "status": "unknown",
+        "since_ts": e.since_ts,
+    }
+
 # --- Main bot loop ---
 
 def main():
@@ -184,7 +257,8 @@ def main():
         ticker = markets[0]["ticker"]
     print(f"[*] Target market: {ticker}")
 
-    # Track outstanding order IDs to manage/cancel our own quotes
+    # Track outstanding order IDs to manage/cancel our own quotes (client_order_id
+    # for orders whose placement never resolved)
     my_orders: Dict[str, Dict[str, Any]] = {}
 
     risk = RiskState(
@@ -232,6 +306,7 @@ def main():
                 if oid and o.get("owner") == me.get("member", {}).get("id"):
                     try:
                         client.cancel_order(oid)
+                        my_orders.pop(oid, None)
                     except Exception as e:
                         print(f"[cancel warn] {e}")
 
@@ -250,6 +325,9 @@ def main():
                     oid = r.get("order", {}).get("order_id")
                     if oid: my_orders[oid] = r["order"]
                     print(f"[quote] BUY YES {PER_ORDER_SIZE}@{buy_px}")
+                except UnresolvedOrder as e:
+                    _track_unresolved(my_orders, e)
+                    print(f"[buy error] {e}")
                 except Exception as e:
                     print(f"[buy error] {e}")
 
@@ -268,6 +346,9 @@ def main():
                     oid = r.get("order", {}).get("order_id")
                     if oid: my_orders[oid] = r["order"]
                     print(f"[quote] SELL YES {PER_ORDER_SIZE}@{sell_px}")
+                except UnresolvedOrder as e:
+                    _track_unresolved(my_orders, e)
+                    print(f"[sell error] {e}")
                 except Exception as e:
                     print(f"[sell error] {e}")
 
@@ -278,15 +359,16 @@ def main():
             time.sleep(POLL_SEC)
 
         except KeyboardInterrupt:
-            print("\n[!] Ctrl-C received. Attempting to cancel working orders...")
-            try:
-                w = client.list_orders(ticker=ticker, status="working")
-                for o in w.get("orders", []):
-                    oid = o.get("order_id")
-                    if oid:
-                        client.cancel_order(oid)
-            except Exception as e:
-                print(f"[cancel on exit warn] {e}")
+            print("\n[!] Ctrl-C received. Cancelling tracked working orders...")
+            # cancel from our local order set concurrently instead of listing first
+            t0 = time.perf_counter()
+            items = list(my_orders.items())
+            if items:
+                with ThreadPoolExecutor(max_workers=min(16, len(items))) as pool:
+                    for (key, _), err in zip(items, pool.map(_try_cancel(client), items)):
+                        if err:
+                            print(f"[cancel on exit warn] {key}: {err}")
+            print(f"[*] Flat in {(time.perf_counter() - t0) * 1000:.1f} ms ({len(items)} orders)")
             break
 
         except requests.HTTPError as he:
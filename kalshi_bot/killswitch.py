@@ -0,0 +1,139 @@
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .orders import TERMINAL_STATUSES
+
+
+class KillSwitch:
+    """
+    Halts trading and pulls every resting order as fast as possible.
+
+    Cancels are sent concurrently straight from OrderManager's locally
+    tracked orders, so there is no list_orders round-trip before the first
+    DELETE goes out. Can be tripped by RiskManager breaches, SIGTERM (handled
+    by the trading loop, see request()), or by creating a kill file.
+    """
+
+    def __init__(self, order_mgr, risk_mgr=None, max_workers=16, cancel_timeout=2.0):
+        self.order_mgr = order_mgr
+        self.risk_mgr = risk_mgr
+        self.max_workers = max_workers
+        self.cancel_timeout = cancel_timeout  # per DELETE, so one hung request can't stall the pass
+        self.tripped = threading.Event()
+        self.requested = None  # reason from a signal handler; the loop acts on it
+        self.report = None
+        self._lock = threading.RLock()
+        if risk_mgr is not None:
+            risk_mgr.on_breach = self.trigger
+
+    def trigger(self, reason):
+        """Halt new orders and mass-cancel. Safe to call more than once."""
+        with self._lock:
+            if self.report is not None:
+                return self.report
+            self.tripped.set()
+            if self.risk_mgr is not None:
+                self.risk_mgr.halted = True
+            print(f"[KILL] {reason}")
+            self.report = self.cancel_all()
+            self.report["reason"] = reason
+            print(f"[KILL] flat in {self.report['seconds'] * 1000:.1f} ms: "
+                  f"{self.report['cancelled']} cancelled, {len(self.report['failed'])} failed")
+            return self.report
+
+    def stop_requested(self):
+        """True once the loop should stop: tripped, or asked to by a signal."""
+        return self.tripped.is_set() or self.requested is not None
+
+    def cancel_all(self):
+        t0 = time.perf_counter()
+        open_orders = self.order_mgr.open_orders()
+        # orders whose submit never resolved have no order_id yet and need a
+        # lookup first; they queue behind the known cancels in the same pool
+        jobs = [(self._cancel_one, coid) for coid, o in open_orders.items() if o.get("order_id")]
+        jobs += [(self._resolve_one, coid) for coid, o in open_orders.items() if not o.get("order_id")]
+        results = []
+        if jobs:
+            workers = min(self.max_workers, len(jobs))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(lambda job: job[0](job[1]), jobs))
+        return {
+            "cancelled": sum(1 for ok in results if ok is True),
+            "failed": [coid for (_, coid), ok in zip(jobs, results) if ok is False],
+            "seconds": time.perf_counter() - t0,
+        }
+
+    def _resolve_one(self, client_order_id):
+        """Look up an unacknowledged order and cancel it if it rests; None if there is nothing to cancel."""
+        found = self.order_mgr.resolve(client_order_id)
+        if found is None:
+            # still unknown means the lookup failed; otherwise it never reached the exchange
+            order = self.order_mgr.orders.get(client_order_id)
+            return False if order is not None and order.get("status") == "unknown" else None
+        if found.get("status") in TERMINAL_STATUSES or not found.get("order_id"):
+            return None
+        return self._cancel_one(client_order_id)
+
+    def _cancel_one(self, client_order_id):
+        try:
+            self.order_mgr.cancel(client_order_id, timeout=self.cancel_timeout)
+            return True
+        except Exception as e:
+            print(f"[KILL cancel error] {client_order_id}: {e}")
+            return False
+
+    def request(self, reason):
+        """
+        Ask the trading loop to stop; it runs the cancels itself via sweep().
+        Only sets attributes, so it is safe inside a signal handler, where
+        taking OrderManager.lock could deadlock against the interrupted code.
+        """
+        if self.risk_mgr is not None:
+            self.risk_mgr.halted = True
+        self.requested = reason
+
+    def install_signal_handlers(self, signals=(signal.SIGTERM,)):
+        """Request a stop on the given signals (main thread only)."""
+        for sig in signals:
+            signal.signal(sig, lambda signum, frame: self.request(signal.Signals(signum).name))
+
+    def sweep(self):
+        """
+        Cancel pass once the trading loop has stopped. After a signal this is
+        the only pass. Otherwise it is the second one: an order that was in
+        flight when the switch tripped can be acknowledged after the first
+        pass took its snapshot, and this catches it.
+        """
+        if not self.stop_requested():
+            return None
+        with self._lock:  # wait out a trigger() still running on another thread
+            if self.report is None:
+                return self.trigger(self.requested or "stop requested")
+        report = self.cancel_all()
+        if report["cancelled"] or report["failed"]:
+            print(f"[KILL] final sweep: {report['cancelled']} cancelled, {len(report['failed'])} failed")
+        return report
+
+    def watch_file(self, path, interval=0.25):
+        """
+        Trip when `path` appears, e.g. `touch /tmp/kalshi.kill`. The file is
+        renamed to <path>.tripped once handled, and refusing to start while it
+        exists keeps a leftover from tripping every restart silently.
+        """
+        if os.path.exists(path):
+            raise RuntimeError(f"kill file {path} exists; remove it to start trading")
+
+        def loop():
+            while not self.tripped.wait(interval):
+                if os.path.exists(path):
+                    try:
+                        os.replace(path, f"{path}.tripped")
+                    except OSError as e:
+                        print(f"[KILL] could not rename {path}: {e}")
+                    self.trigger(f"kill file {path}")
+        t = threading.Thread(target=loop, name="killswitch-file", daemon=True)
+        t.start()
+        return t
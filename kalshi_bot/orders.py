@@ -0,0 +1,197 @@
+import threading
+import time
+import uuid
+
+import requests
+from requests.exceptions import HTTPError
+
+
+TERMINAL_STATUSES = ("canceled", "executed")
+
+# reconcile look-back when we can't bound how far our clock is from the exchange's
+UNSYNCED_MARGIN_SEC = 60
+
+
+class OrderManager:
+    """
+    Submits orders under client-assigned IDs and tracks them locally.
+
+    A timed-out POST is ambiguous: the order may or may not be live. Instead of
+    backing off, we look the order up by client_order_id and only resend (with
+    the same ID, so the exchange rejects a duplicate) if it isn't there.
+    """
+
+    def __init__(self, client, submit_timeout=1.5, lookup_timeout=1.5, max_attempts=3):
+        self.client = client
+        self.submit_timeout = submit_timeout
+        self.lookup_timeout = lookup_timeout
+        self.max_attempts = max_attempts
+        self.orders = {}  # client_order_id -> latest known order dict
+        self.listeners = []  # callables(order) run on every ack/update
+        # guards self.orders: the kill switch reads it from other threads
+        self.lock = threading.RLock()
+
+    def submit(self, payload):
+        """
+        Place an order, retrying timeouts with the same client_order_id.
+        Returns the exchange response ({"order": {...}}).
+        """
+        payload = dict(payload)
+        coid = payload.setdefault("client_order_id", str(uuid.uuid4()))
+        since_ts = self._since_ts()
+
+        for _ in range(self.max_attempts):
+            try:
+                res = self.client.place_order(payload, timeout=self.submit_timeout)
+                return self._track(coid, res.get("order", {}))
+            except (requests.Timeout, requests.ConnectionError) as e:
+                print(f"[order timeout] {coid}: {type(e).__name__}, reconciling")
+            except HTTPError as e:
+                # 409 means the exchange already has this client_order_id,
+                # i.e. an earlier attempt we never heard back from went through
+                if e.response is None or e.response.status_code != 409:
+                    raise
+
+            order = self.reconcile(payload["ticker"], coid, since_ts)
+            if order is not None:
+                return self._track(coid, order)
+
+        # the order may still be live: keep tracking it so resync() and the
+        # kill switch can look it up by client_order_id later
+        self._track(coid, {
+            "client_order_id": coid,
+            "ticker": payload["ticker"],
+            "status": "unknown",
+            "since_ts": since_ts,
+        })
+        raise RuntimeError(f"order {coid} unresolved after {self.max_attempts} attempts")
+
+    def _since_ts(self):
+        """
+        Lower bound (exchange epoch seconds) for the reconcile min_ts filter.
+        Uses the client's clock when attached, widened by its uncertainty;
+        an unsynced clock gets a wide margin since only this ticker is listed.
+        """
+        clock = getattr(self.client, "clock", None)
+        if clock is None:
+            return int(time.time()) - UNSYNCED_MARGIN_SEC
+        uncertainty = clock.uncertainty()
+        margin = 1 + (uncertainty if uncertainty is not None else UNSYNCED_MARGIN_SEC)
+        return int(clock.now() - margin)
+
+    def resolve(self, client_order_id):
+        """
+        Look up an order we never got an ack for; returns it if found. One
+        still missing from a successful listing long after it was sent never
+        reached the exchange, and is forgotten.
+        """
+        order = self.orders[client_order_id]
+        since_ts = order.get("since_ts", 0)
+        try:
+            found = self._find(order["ticker"], client_order_id, since_ts)
+        except requests.RequestException as e:
+            print(f"[reconcile warn] {client_order_id}: {e}")
+            return None
+        if found is not None:
+            self._track(client_order_id, found)
+        elif time.time() - since_ts > 2 * UNSYNCED_MARGIN_SEC:
+            with self.lock:
+                self.orders.pop(client_order_id, None)
+        return found
+
+    def unresolved(self, ticker):
+        """
+        True while an order on `ticker` is in an unknown state (it may be
+        live). Each one is looked up again first.
+        """
+        for coid, order in self.open_orders().items():
+            if order.get("ticker") == ticker and order.get("status") == "unknown":
+                if self.resolve(coid) is None and coid in self.orders:
+                    return True
+        return False
+
+    def reconcile(self, ticker, client_order_id, since_ts):
+        """Find an order we submitted by its client_order_id, or None."""
+        try:
+            return self._find(ticker, client_order_id, since_ts)
+        except requests.RequestException as e:
+            print(f"[reconcile warn] {client_order_id}: {e}")
+            return None
+
+    def _find(self, ticker, client_order_id, since_ts):
+        res = self.client.list_orders(
+            {"ticker": ticker, "min_ts": since_ts},
+            timeout=self.lookup_timeout,
+        )
+        for o in res.get("orders", []):
+            if o.get("client_order_id") == client_order_id:
+                return o
+        return None
+
+    def resync(self, tickers=None):
+        """
+        After a warm restart, reconcile restored orders with the exchange: one
+        list of resting orders per ticker, plus a lookup only for orders we
+        thought were open that no longer rest. Only orders we already track
+        are updated; other orders on the account are left alone. Returns how
+        many orders changed.
+        """
+        queries = [{"status": "resting", "ticker": t} for t in tickers] if tickers else [{"status": "resting"}]
+        live = {}
+        for params in queries:
+            res = self.client.list_orders(params, timeout=self.lookup_timeout)
+            for o in res.get("orders", []):
+                if o.get("client_order_id") in self.orders:
+                    live[o["client_order_id"]] = o
+
+        changed = 0
+        for coid, order in list(self.open_orders().items()):
+            if coid in live:
+                if live[coid] != order:
+                    self.orders[coid] = live[coid]
+                    changed += 1
+                continue
+            changed += 1
+            if not order.get("order_id"):
+                # never acknowledged and not resting now: nothing left to cancel
+                del self.orders[coid]
+                continue
+            try:
+                self.orders[coid] = self.client.get_order(
+                    order["order_id"], timeout=self.lookup_timeout
+                ).get("order", order)
+            except Exception as e:
+                print(f"[resync warn] {coid}: {e}")
+                self.orders[coid] = dict(order, status="unknown")
+        return changed
+
+    def open_orders(self):
+        """client_order_id -> order for everything not known to be finished."""
+        with self.lock:
+            items = list(self.orders.items())
+        return {coid: o for coid, o in items if o.get("status") not in TERMINAL_STATUSES}
+
+    def resting(self):
+        """client_order_id -> order for open orders we can cancel (have an order_id)."""
+        return {coid: o for coid, o in self.open_orders().items() if o.get("order_id")}
+
+    def prune(self):
+        """Forget canceled/executed orders. Returns the remaining orders."""
+        with self.lock:
+            for coid in [c for c, o in self.orders.items() if o.get("status") in TERMINAL_STATUSES]:
+                del self.orders[coid]
+            return dict(self.orders)
+
+    def cancel(self, client_order_id, timeout=None):
+        """Cancel a tracked order by its client_order_id."""
+        order = self.orders[client_order_id]
+        res = self.client.cancel_order(order["order_id"], timeout=timeout)
+        self._track(client_order_id, res.get("order", order))
+        return res
+
+    def _track(self, client_order_id, order):
+        with self.lock:
+            self.orders[client_order_id] = order
+        for cb in self.listeners:
+            cb(order)
+        return {"order": order}
@@ -0,0 +1,151 @@
+import multiprocessing as mp
+import traceback
+from multiprocessing.shared_memory import SharedMemory
+
+# (leg, side) order of the per-ticker level arrays in shared memory
+SIDES = (("yes", "bids"), ("yes", "asks"), ("no", "bids"), ("no", "asks"))
+
+
+def _slot_size(max_levels):
+    # one level count per side, then (price, qty) pairs per side
+    return len(SIDES) + len(SIDES) * max_levels * 2
+
+
+def _write_book(buf, base, orderbook, max_levels):
+    for i, (leg, side) in enumerate(SIDES):
+        levels = orderbook.get(leg, {}).get(side, [])[:max_levels]
+        buf[base + i] = len(levels)
+        off = base + len(SIDES) + i * max_levels * 2
+        for j, (px, qty) in enumerate(levels):
+            buf[off + 2 * j] = px
+            buf[off + 2 * j + 1] = qty
+
+
+def _read_book(buf, base, max_levels):
+    book = {"yes": {}, "no": {}}
+    for i, (leg, side) in enumerate(SIDES):
+        n = buf[base + i]
+        off = base + len(SIDES) + i * max_levels * 2
+        book[leg][side] = [[buf[off + 2 * j], buf[off + 2 * j + 1]] for j in range(n)]
+    return book
+
+
+def _worker(conn, shm_name, slots, factory, tickers, max_levels):
+    shm = SharedMemory(name=shm_name)
+    buf = shm.buf.cast("i")
+    strats = {t: factory(t) for t in tickers}
+    try:
+        while True:
+            msg = conn.recv()
+            if msg is None:
+                break
+            positions, account = msg
+            out = []
+            for t in tickers:
+                # one failing strategy must not take down the shard
+                try:
+                    ob = _read_book(buf, slots[t], max_levels)
+                    intents = strats[t].on_book(ob, positions, account)
+                    for intent in intents:
+                        intent.ticker = t
+                    out.append((t, intents, None))
+                except Exception:
+                    out.append((t, [], traceback.format_exc()))
+            conn.send(out)
+    finally:
+        buf.release()
+        shm.close()
+
+
+class StrategyPool:
+    """
+    Runs one strategy instance per ticker, sharded across worker processes.
+
+    Books are written into a shared-memory block (fixed slot per ticker) so
+    only positions/account and the resulting intents cross the pipes. Strategy
+    state stays in the worker that owns the ticker. step() returns intents in
+    the order of `tickers`, regardless of which worker finished first, so the
+    single execution/risk process sees a deterministic stream. A strategy that
+    raises contributes no intents for that step; its traceback is in .errors.
+
+    factory(ticker) must build the strategy and be picklable.
+    """
+
+    def __init__(self, factory, tickers, workers=None, max_levels=32):
+        self.tickers = tuple(tickers)
+        self.max_levels = max_levels
+        workers = max(1, min(workers or mp.cpu_count(), len(self.tickers)))
+
+        size = _slot_size(max_levels)
+        self.slots = {t: i * size for i, t in enumerate(self.tickers)}
+        self.shm = SharedMemory(create=True, size=max(1, len(self.tickers) * size * 4))
+        self.buf = self.shm.buf.cast("i")
+
+        self.conns = []
+        self.procs = []
+        self.errors = {}  # ticker -> traceback from the last step()
+        for w in range(workers):
+            shard = self.tickers[w::workers]
+            parent, child = mp.Pipe()
+            p = mp.Process(
+                target=_worker,
+                args=(child, self.shm.name, self.slots, factory, shard, max_levels),
+                daemon=True,
+            )
+            p.start()
+            child.close()
+            self.conns.append(parent)
+            self.procs.append(p)
+
+    def step(self, books, positions, account):
+        """
+        books: ticker -> orderbook for every pool ticker. Returns the combined
+        list of OrderIntents, each tagged with its ticker.
+        """
+        for t in self.tickers:
+            _write_book(self.buf, self.slots[t], books[t], self.max_levels)
+        dead = []
+        for w, conn in enumerate(self.conns):
+            try:
+                conn.send((positions, account))
+            except (BrokenPipeError, OSError):
+                dead.append(w)
+
+        by_ticker = {}
+        self.errors = {}
+        # drain every worker before reporting a failure, so no reply is left
+        # sitting in a pipe to be mistaken for the next step's
+        for w, conn in enumerate(self.conns):
+            if w in dead:
+                continue
+            try:
+                reply = conn.recv()
+            except (EOFError, OSError):
+                dead.append(w)
+                continue
+            for t, intents, err in reply:
+                by_ticker[t] = intents
+                if err is not None:
+                    self.errors[t] = err
+                    print(f"[pool] {t} strategy error:\n{err}")
+        if dead:
+            raise RuntimeError(f"strategy pool workers {dead} died")
+        return [intent for t in self.tickers for intent in by_ticker[t]]
+
+    def close(self):
+        for conn in self.conns:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for p in self.procs:
+            p.join(timeout=5)
+        self.buf.release()
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,56 @@
+import importlib
+import inspect
+
+ENTRY_POINT_GROUP = "kalshi_bot.strategies"
+
+# name -> "module:Class"; modules are only imported when the strategy is used
+STRATEGIES = {
+    "market_maker": "kalshi_bot.strats.market_maker:MarketMaker",
+    "momentum": "kalshi_bot.strats.momentum:Momentum",
+    "calendar_spread": "kalshi_bot.strats.calendar_spread:CalendarSpread",
+}
+
+_loaded = {}
+
+
+def register(name, target):
+    """Register a strategy class, or a "module:Class" string to import lazily."""
+    STRATEGIES[name] = target
+    _loaded.pop(name, None)
+
+
+def available():
+    return sorted(STRATEGIES)
+
+
+def _from_entry_points(name):
+    from importlib.metadata import entry_points
+
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        if ep.name == name:
+            return ep.value
+    return None
+
+
+def load(name):
+    """Return the strategy class for `name`, importing its module on first use."""
+    if name in _loaded:
+        return _loaded[name]
+    target = STRATEGIES.get(name) or _from_entry_points(name)
+    if target is None:
+        raise ValueError(f"Unknown strategy {name!r}; available: {', '.join(available())}")
+    if isinstance(target, str):
+        module, _, attr = target.partition(":")
+        target = getattr(importlib.import_module(module), attr)
+    _loaded[name] = target
+    return target
+
+
+def build(name, **options):
+    """
+    Instantiate a strategy, passing only the options its constructor accepts
+    (so the runner can offer one flat set of CLI options to every strategy).
+    """
+    cls = load(name)
+    params = inspect.signature(cls).parameters
+    return cls(**{k: v for k, v in options.items() if k in params and v is not None})
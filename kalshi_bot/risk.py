@@ -8,19 +8,45 @@ class RiskManager:
         self.pnl_stop_cents = pnl_stop_cents
         self.net_yes = 0
         self.realized_pnl = 0
+        self.halted = False
+        self.on_breach = None  # called once with a reason when the PnL stop trips
 
     def update_position(self, net_yes, pnl):
         self.net_yes = net_yes
         self.realized_pnl = pnl
+        self.check_stop()
+
+    def check_stop(self):
+        """Halt (and fire on_breach) the first time PnL is at or below the stop."""
+        if not self.halted and self.realized_pnl <= self.pnl_stop_cents:
+            self.halted = True
+            if self.on_breach:
+                self.on_breach(f"pnl stop {self.realized_pnl} <= {self.pnl_stop_cents}")
+        return self.halted
 
     def allow(self, order_intent):
+        # PnL stop / kill switch
+        if self.check_stop():
+            return False
         # inventory check
         if order_intent.action == "BUY" and self.net_yes >= self.max_inventory:
             return False
         if order_intent.action == "SELL" and self.net_yes <= -self.max_inventory:
             return False
-        # PnL stop
-        if self.realized_pnl <= self.pnl_stop_cents:
-            return False
         return True
 
+def position_summary(positions, ticker, tickers):
+    """
+    (net YES contracts in `ticker`, realized PnL in cents net of fees across
+    `tickers`) from a list_positions response.
+    """
+    net_yes = 0
+    pnl = 0
+    for p in positions.get("market_positions", []):
+        if p.get("ticker") not in tickers:
+            continue
+        if p.get("ticker") == ticker:
+            net_yes = int(p.get("position", 0))
+        pnl += int(p.get("realized_pnl", 0)) - int(p.get("fees_paid", 0))
+    return net_yes, pnl
+
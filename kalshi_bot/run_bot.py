@@ -1,85 +1,200 @@
-import os
 import time
 import argparse
-from dotenv import load_dotenv
 
-from kalshi_bot.client import KalshiClient
-from kalshi_bot.risk import RiskManager
+from kalshi_bot import checkpoint, registry
+from kalshi_bot.config import load_config, make_http_client
+from kalshi_bot.risk import RiskManager, position_summary
+from kalshi_bot.account import AccountCache
 from kalshi_bot.execution import ExecutionEngine
+from kalshi_bot.killswitch import KillSwitch
+from kalshi_bot.data import MarketContext
+from kalshi_bot.strat_base import MultiLegStrategy
+from kalshi_bot.triggers import InputGate
+from kalshi_bot.timesync import ClockSync, parse_ts
 from kalshi_bot.utils import log_to_csv, timestamp
 
-# import strategies
-from kalshi_bot.strats.market_maker import MarketMaker
-from kalshi_bot.strats.momentum import Momentum
-from kalshi_bot.strats.calendar_spread import CalendarSpread
-
-STRAT_MAP = {
-    "market_maker": MarketMaker,
-    "momentum": Momentum,
-    "calendar_spread": CalendarSpread,
-}
-
 def main():
-    load_dotenv()
-
     parser = argparse.ArgumentParser()
     parser.add_argument("--ticker", required=True, help="Market ticker to trade")
-    parser.add_argument("--strategy", choices=STRAT_MAP.keys(), default="market_maker")
+    parser.add_argument("--strategy", default="market_maker",
+                        help=f"Strategy name ({', '.join(registry.available())} or a registered plugin)")
     parser.add_argument("--spread", type=int, default=4, help="Spread for market maker")
     parser.add_argument("--size", type=int, default=1, help="Order size")
+    parser.add_argument("--account-ttl", type=float, default=5.0, help="Seconds to cache balance/positions")
+    parser.add_argument("--kill-file", default="kalshi.kill", help="Create this file to cancel everything and stop")
+    parser.add_argument("--stop-before-close", type=float, default=60.0,
+                        help="Cancel everything and stop this many seconds before market close (exchange time)")
+    parser.add_argument("--legs", default="", help="Comma-separated related tickers for multi-leg strategies")
+    parser.add_argument("--checkpoint", default=None,
+                        help="Checkpoint file for warm restarts (default state/<strategy>-<ticker>.ckpt)")
+    parser.add_argument("--checkpoint-every", type=float, default=30.0, help="Seconds between checkpoints")
     args = parser.parse_args()
 
     # --- Init layers ---
-    client = KalshiClient()
-    #client.login()
-    #me = client.me()
-    balance = client.balance()
-    #print(f"[*] Logged in as {me.get('member', {}).get('email')}")
-    print(f"[*] Current balance {balance}")
-    print(balance)
-
+    config = load_config()
+    client = make_http_client(config)
+    clock = ClockSync()
+    client.clock = clock  # offset is learned from every response's Date header
+    account = AccountCache(client, ttl=args.account_ttl)
     risk_mgr = RiskManager(max_inventory=20, pnl_stop_cents=-3000)
-    strat_cls = STRAT_MAP[args.strategy]
-    if args.strategy == "market_maker":
-        strat = strat_cls(spread=args.spread, size=args.size)
+    engine = ExecutionEngine(client, args.ticker, risk_mgr)
+    kill = KillSwitch(engine.order_mgr, risk_mgr)
+    kill.install_signal_handlers()
+    kill.watch_file(args.kill_file)
+    books = {}  # ticker -> latest orderbook, shared with strategies via MarketContext
+
+    legs = [t for t in args.legs.split(",") if t]
+    strat_opts = {
+        "spread": args.spread,
+        "size": args.size,
+        "near": args.ticker,
+        "far": legs[0] if legs else None,
+    }
+
+    # --- Warm restart: reuse the last checkpoint if it was for the same setup ---
+    ckpt_path = args.checkpoint or f"state/{args.strategy}-{args.ticker}.ckpt"
+    ckpt = checkpoint.load(ckpt_path)
+    if ckpt is not None and (ckpt["strategy_name"], ckpt["strategy_options"]) != (args.strategy, strat_opts):
+        print(f"[checkpoint] {ckpt_path} is for a different strategy setup; starting cold")
+        ckpt = None
+
+    strat = registry.build(args.strategy, **strat_opts)
+    if ckpt is not None:
+        try:
+            strat.set_state(ckpt["strategy_state"])
+        except Exception as e:
+            # state saved by a different version of the strategy
+            print(f"[checkpoint] strategy state not restored ({type(e).__name__}: {e}); starting it fresh")
+            strat = registry.build(args.strategy, **strat_opts)
+        books.update(ckpt["books"])
+        account.restore(ckpt["account"])
+        risk_mgr.net_yes = ckpt["risk"]["net_yes"]
+        risk_mgr.realized_pnl = ckpt["risk"]["realized_pnl"]
+        engine.order_mgr.orders.update(ckpt["orders"])
+        open_ts, close_ts = ckpt["market_hours"]
+        # reconcile only what moved while we were down
+        try:
+            changed = engine.order_mgr.resync(ckpt["tickers"])
+        except Exception as e:
+            # keep the restored orders; the kill switch can still cancel them
+            print(f"[checkpoint] order resync failed: {type(e).__name__}: {e}")
+            changed = "?"
+        try:
+            if client.list_fills({"min_ts": int(ckpt["saved_at"])}).get("fills"):
+                account.invalidate()
+        except Exception as e:
+            # can't tell whether we traded while down: refetch balance/positions
+            print(f"[checkpoint] fill check failed: {type(e).__name__}: {e}")
+            account.invalidate()
+        print(f"[*] Restored checkpoint {ckpt_path} ({changed} orders changed since)")
     else:
-        strat = strat_cls(size=args.size)
+        balance = account.balance()
+        print(f"[*] Current balance {balance}")
 
-    engine = ExecutionEngine(client, args.ticker, risk_mgr)
+    engine.order_mgr.listeners.append(account.on_order)
+    multi_leg = isinstance(strat, MultiLegStrategy)
+    ctx = MarketContext(books, strat.tickers) if multi_leg else None
+    tickers = ctx.tickers if multi_leg else (args.ticker,)
+    gate = InputGate(strat.inputs, tickers, strat.depth_levels)
+
+    if ckpt is None:
+        # market hours, compared against exchange time rather than the local clock
+        markets = [client.get_market(t).get("market", {}) for t in tickers]
+        open_ts = max(filter(None, (parse_ts(m.get("open_time")) for m in markets)), default=None)
+        close_ts = min(filter(None, (parse_ts(m.get("close_time")) for m in markets)), default=None)
+
+    def state():
+        return {
+            "saved_at": clock.now(),
+            "strategy_name": args.strategy,
+            "strategy_options": strat_opts,
+            "strategy_state": strat.get_state(),
+            "books": dict(books),
+            "tickers": tickers,
+            "orders": engine.order_mgr.prune(),
+            "account": account.snapshot(),
+            "risk": {"net_yes": risk_mgr.net_yes, "realized_pnl": risk_mgr.realized_pnl},
+            "market_hours": (open_ts, close_ts),
+        }
+
+    checkpointer = checkpoint.Checkpointer(ckpt_path, interval=args.checkpoint_every)
+
+    def log_orders(placed):
+        for order in placed:
+            order_data = order.get("order", {})
+            row = {
+                "ts": timestamp(),
+                "ticker": order_data.get("ticker", args.ticker),
+                "strategy": args.strategy,
+                "action": order_data.get("action"),
+                "side": order_data.get("side"),
+                "price": order_data.get("price"),
+                "size": order_data.get("size"),
+            }
+            log_to_csv("logs/trades.csv", row, list(row.keys()))
 
     print(f"[*] Running {args.strategy} on {args.ticker}...")
 
     # --- Main loop ---
-    while True:
+    while not kill.stop_requested():
         try:
-            ob = client.get_orderbook(args.ticker)
-            acct = client.balance()
-            pos = client.list_positions()
-
-            intents = strat.on_book(ob, pos, acct)
-            placed = engine.execute(intents)
-
-            for order in placed:
-                order_data = order.get("order", {})
-                row = {
-                    "ts": timestamp(),
-                    "ticker": args.ticker,
-                    "strategy": args.strategy,
-                    "action": order_data.get("action"),
-                    "side": order_data.get("side"),
-                    "price": order_data.get("price"),
-                    "size": order_data.get("size"),
-                }
-                log_to_csv("logs/trades.csv", row, list(row.keys()))
+            now = clock.now()
+            if close_ts is not None and now >= close_ts - args.stop_before_close:
+                kill.trigger(f"market close in {close_ts - now:.0f}s (exchange time)")
+                break
+            if open_ts is not None and now < open_ts:
+                time.sleep(min(2.0, open_ts - now))
+                continue
+
+            checkpointer.maybe_save(state)
+            # a new fill on one of our orders moves balance and positions; only
+            # worth asking about when the cache would otherwise be served
+            fills = None
+            if gate.wants("fills"):
+                fills = client.list_fills()
+            elif account.fresh():
+                fills = client.list_fills({"limit": 1})
+            if fills is not None:
+                account.check_fills(fills)
+            acct = account.balance()
+            pos = account.positions()
+            risk_mgr.update_position(*position_summary(pos, args.ticker, tickers))
+
+            for t in tickers:
+                books[t] = client.get_orderbook(t)
+
+            # only wake the strategy when something it subscribes to moved;
+            # otherwise just resend what the exchange rejected last time
+            if not gate.changed(books, pos, fills):
+                if engine.retry:
+                    log_orders(engine.execute(engine.retry))
+                time.sleep(2.0)
+                continue
+
+            if multi_leg:
+                intents = strat.on_books(ctx, pos, acct)
+                placed = engine.execute_legs(intents)
+            else:
+                intents = strat.on_book(books[args.ticker], pos, acct)
+                placed = engine.execute(intents)
+            gate.commit()
+            log_orders(placed)
 
             time.sleep(2.0)  # poll frequency
         except KeyboardInterrupt:
             print("\n[!] Stopping bot...")
+            kill.trigger("SIGINT")
             break
         except Exception as e:
             print(f"[loop error] {type(e).__name__}: {e}")
             time.sleep(2.0)
 
+    kill.sweep()
+    checkpointer.save(state())
+    print(f"[*] Strategy invocations: {gate.stats()}")
+    print(f"[*] Account cache: {account.stats()}")
+    print(f"[*] Clock: {clock.stats()}")
+
 if __name__ == "__main__":
     main()
 
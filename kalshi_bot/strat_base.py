@@ -5,6 +5,11 @@ class Strategy(ABC):
     Base strategy interface.
     """
 
+    # market inputs whose changes wake the strategy: "top", "depth", "position", "fills"
+    inputs = ("top",)
+    # levels per side the strategy reads when it subscribes to "depth"; None = all
+    depth_levels = None
+
     @abstractmethod
     def on_book(self, orderbook, positions, account):
         """
@@ -12,3 +17,33 @@ class Strategy(ABC):
         """
         pass
 
+    def get_state(self):
+        """
+        State learned while running (indicator values, regimes, ...) as plain
+        data, for checkpoints. Configuration is rebuilt from the options.
+        """
+        return {}
+
+    def set_state(self, state):
+        """Restore what get_state() returned, on a freshly built instance."""
+        pass
+
+
+class MultiLegStrategy(Strategy):
+    """
+    Strategy over several related markets (e.g. strikes or expiries of one event).
+    """
+
+    tickers = ()
+
+    @abstractmethod
+    def on_books(self, ctx, positions, account):
+        """
+        Given a MarketContext over self.tickers, return a list of OrderIntents
+        with .ticker set on each leg.
+        """
+        pass
+
+    def on_book(self, orderbook, positions, account):
+        # single-book callbacks carry no cross-market information
+        return []
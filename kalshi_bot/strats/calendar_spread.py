@@ -1,17 +1,39 @@
-from ..strat_base import Strategy
+from ..strat_base import MultiLegStrategy
 from ..execution import OrderIntent
+from ..risk import position_summary
 
-class CalendarSpread(Strategy):
+class CalendarSpread(MultiLegStrategy):
     """
-    Example: long one contract in one market, short in a related future market.
-    Placeholder for real logic.
+    Short the near market, long a related future market, when they are
+    mispriced against each other.
+
+    The far expiry should trade at or above the near one (more time for the
+    event to happen). When the near bid exceeds the far ask by at least
+    min_edge cents, sell near and buy far at those prices as one package.
+    Stops adding once the near position reaches max_position contracts.
     """
 
-    def __init__(self, size=1):
-        self.size = size
+    inputs = ("top", "position")
 
-    def on_book(self, orderbook, positions, account):
-        # TODO: implement cross-market logic
-        # For now, just returns no orders.
-        return []
+    def __init__(self, near, far, size=1, min_edge=2, max_position=10):
+        self.tickers = (near, far)
+        self.size = size
+        self.min_edge = min_edge
+        self.max_position = max_position
 
+    def on_books(self, ctx, positions, account):
+        near, far = self.tickers
+        nq = ctx.quote(near)
+        fq = ctx.quote(far)
+        if nq is None or fq is None or nq.yes_bid is None or fq.yes_ask is None:
+            return []
+        if nq.yes_bid - fq.yes_ask < self.min_edge:
+            return []
+        net_near, _ = position_summary(positions or {}, near, self.tickers)
+        size = min(self.size, self.max_position + net_near)  # net_near < 0 while short near
+        if size <= 0:
+            return []
+        return [
+            OrderIntent("SELL", "YES", nq.yes_bid, size, ticker=near),
+            OrderIntent("BUY", "YES", fq.yes_ask, size, ticker=far),
+        ]
@@ -1,15 +1,23 @@
 from ..strat_base import Strategy
 from ..execution import OrderIntent
 from ..data import mid_price, parse_orderbook
+from ..features import BookFeatures
 
 class MarketMaker(Strategy):
-    def __init__(self, spread=4, size=1):
+    inputs = ("depth", "position")
+
+    def __init__(self, spread=4, size=1, levels=5):
         self.spread = spread
         self.size = size
+        self.book = BookFeatures(levels=levels)
+        self.depth_levels = levels  # the microprice only reads this window
 
     def on_book(self, orderbook, positions, account):
-        book = parse_orderbook(orderbook)
-        mid = mid_price(book)
+        # quote around the depth-weighted microprice; fall back to the plain
+        # mid when one side of the book is empty
+        mid = self.book.load(orderbook).features().microprice
+        if mid is None:
+            mid = mid_price(parse_orderbook(orderbook))
         if mid is None:
             return []
         buy_px = max(1, int(mid - self.spread/2))
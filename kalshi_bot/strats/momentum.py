@@ -1,29 +1,49 @@
 from ..strat_base import Strategy
 from ..execution import OrderIntent
 from ..data import mid_price, parse_orderbook
+from ..indicators import EMA
 
 class Momentum(Strategy):
     """
-    Naive momentum: if mid is trending up, buy YES; if trending down, sell YES.
+    EMA crossover momentum: buy YES when the fast EMA of the mid rises more
+    than `threshold` cents above the slow one, sell when it falls below.
+    Only trades when the regime flips, so one-cent wiggles don't churn orders.
     """
 
-    def __init__(self, size=1):
+    def __init__(self, size=1, fast=5, slow=20, threshold=0.5):
         self.size = size
-        self.last_mid = None
+        self.fast = EMA(span=fast)
+        self.slow = EMA(span=slow)
+        self.threshold = threshold
+        self.regime = 0  # +1 up, -1 down, 0 flat
+
+    def get_state(self):
+        return {"fast": self.fast.value, "slow": self.slow.value, "regime": self.regime}
+
+    def set_state(self, state):
+        self.fast.value = state["fast"]
+        self.slow.value = state["slow"]
+        self.regime = state["regime"]
 
     def on_book(self, orderbook, positions, account):
         book = parse_orderbook(orderbook)
         mid = mid_price(book)
-        if mid is None or self.last_mid is None:
-            self.last_mid = mid
+        if mid is None:
             return []
 
-        intents = []
-        if mid > self.last_mid:
-            intents.append(OrderIntent("BUY", "YES", int(mid), self.size))
-        elif mid < self.last_mid:
-            intents.append(OrderIntent("SELL", "YES", int(mid), self.size))
+        signal = self.fast.update(mid) - self.slow.update(mid)
+        if signal > self.threshold:
+            regime = 1
+        elif signal < -self.threshold:
+            regime = -1
+        else:
+            regime = 0
 
-        self.last_mid = mid
+        intents = []
+        if regime != self.regime:
+            if regime == 1:
+                intents.append(OrderIntent("BUY", "YES", int(mid), self.size))
+            elif regime == -1:
+                intents.append(OrderIntent("SELL", "YES", int(mid), self.size))
+        self.regime = regime
         return intents
-
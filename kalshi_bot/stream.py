@@ -0,0 +1,198 @@
+import asyncio
+import json
+import time
+from collections import deque
+
+from .client import Environment, KalshiWebSocketClient
+
+# message types where only the newest update per ticker matters; they are
+# replaced in place. Deltas, fills and trades must all be delivered in order.
+COALESCE_TYPES = ("ticker",)
+
+# a snapshot supersedes everything queued before it for the same book: pending
+# deltas and snapshots for that ticker are dropped and the new one goes to
+# the tail, so no stale delta is ever applied on top of it
+SNAPSHOT_TYPE = "orderbook_snapshot"
+BOOK_TYPES = (SNAPSHOT_TYPE, "orderbook_delta")
+
+
+def _market(event):
+    return event.get("msg", {}).get("market_ticker")
+
+
+class EventBus:
+    """
+    Single in-process queue that every WebSocket shard publishes into.
+
+    Coalescable messages are keyed by (type, market_ticker): while one is
+    still waiting, a newer one replaces it in place, so a lagging consumer
+    only ever sees the latest ticker update per market. Book snapshots drop
+    the pending book messages for their ticker. Everything else goes through
+    a bounded FIFO; when that is full, publish() waits (backpressure on the
+    producing shard) instead of dropping.
+    """
+
+    def __init__(self, maxsize=10000, coalesce_types=COALESCE_TYPES):
+        self.maxsize = maxsize
+        self.coalesce_types = frozenset(coalesce_types)
+        self._order = deque()  # (key, None) for coalesced entries, (None, event) otherwise
+        self._latest = {}      # key -> pending coalesced event
+        self._fifo_len = 0
+        self._cond = asyncio.Condition()
+        self.published = 0
+        self.coalesced = 0
+        self.superseded = 0  # book messages dropped because a newer snapshot arrived
+        self.blocked = 0  # publishes that had to wait for space
+
+    async def publish(self, event):
+        msg_type = event.get("type")
+        async with self._cond:
+            if msg_type in self.coalesce_types:
+                key = (msg_type, _market(event))
+                if key in self._latest:
+                    self.coalesced += 1
+                else:
+                    self._order.append((key, None))
+                self._latest[key] = event
+            else:
+                if msg_type == SNAPSHOT_TYPE:
+                    self._drop_book(_market(event))
+                if self._fifo_len >= self.maxsize:
+                    self.blocked += 1
+                    await self._cond.wait_for(lambda: self._fifo_len < self.maxsize)
+                self._order.append((None, event))
+                self._fifo_len += 1
+            self.published += 1
+            self._cond.notify_all()
+
+    def _drop_book(self, market):
+        kept = deque(
+            (key, ev) for key, ev in self._order
+            if ev is None or ev.get("type") not in BOOK_TYPES or _market(ev) != market
+        )
+        dropped = len(self._order) - len(kept)
+        if dropped:
+            self._order = kept
+            self._fifo_len -= dropped
+            self.superseded += dropped
+
+    async def get(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._order)
+            key, event = self._order.popleft()
+            if key is not None:
+                event = self._latest.pop(key)
+            else:
+                self._fifo_len -= 1
+            self._cond.notify_all()
+            return event
+
+    def depth(self):
+        return len(self._order)
+
+    def stats(self):
+        return {
+            "depth": self.depth(),
+            "pending_coalesced": len(self._latest),
+            "pending_fifo": self._fifo_len,
+            "published": self.published,
+            "coalesced": self.coalesced,
+            "superseded": self.superseded,
+            "blocked": self.blocked,
+        }
+
+
+class _Shard(KalshiWebSocketClient):
+    """One connection subscribed to a slice of the tickers, feeding the bus."""
+
+    def __init__(self, shard_id, bus, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.shard_id = shard_id
+        self.bus = bus
+        self.decodes_messages = True
+        self.messages = 0
+        self._window_start = time.monotonic()
+        self._window_messages = 0
+
+    async def on_open(self):
+        print(f"[stream] shard {self.shard_id} connected ({len(self.tickers)} tickers)")
+        await self.subscribe_to_tickers()
+
+    async def on_message(self, message):
+        event = json.loads(message)
+        if self.clock is not None:
+            self.observe_event(event)
+        event["shard"] = self.shard_id
+        self.messages += 1
+        await self.bus.publish(event)
+
+    async def on_error(self, error):
+        print(f"[stream] shard {self.shard_id} error: {error}")
+
+    async def on_close(self, close_status_code, close_msg):
+        print(f"[stream] shard {self.shard_id} closed: {close_status_code} {close_msg}")
+
+    def rate(self):
+        """Messages/s since the previous call."""
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        n = self.messages - self._window_messages
+        self._window_start, self._window_messages = now, self.messages
+        return n / elapsed if elapsed > 0 else 0.0
+
+
+class ShardedStream:
+    """
+    Splits `tickers` round-robin across `shards` WebSocket connections, each
+    subscribed only to its own market list, all fanned into one EventBus.
+    Shards reconnect independently after `reconnect_delay` seconds.
+    """
+
+    def __init__(
+        self,
+        key_id,
+        private_key,
+        tickers,
+        environment=Environment.DEMO,
+        shards=4,
+        channels=("ticker",),
+        bus=None,
+        clock=None,
+        reconnect_delay=1.0,
+    ):
+        tickers = list(tickers)
+        if not tickers:
+            # an empty market list would subscribe to every market
+            raise ValueError("ShardedStream needs at least one ticker")
+        self.bus = bus or EventBus()
+        self.reconnect_delay = reconnect_delay
+        n = max(1, min(shards, len(tickers)))
+        self.shards = []
+        for i in range(n):
+            shard = _Shard(
+                i, self.bus, key_id, private_key, environment,
+                tickers=tickers[i::n], channels=list(channels),
+            )
+            shard.clock = clock
+            self.shards.append(shard)
+
+    async def _run_shard(self, shard):
+        while True:
+            try:
+                await shard.connect()
+            except Exception as e:
+                print(f"[stream] shard {shard.shard_id} connect failed: {e}")
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def run(self):
+        await asyncio.gather(*(self._run_shard(s) for s in self.shards))
+
+    def stats(self):
+        return {
+            "shards": [
+                {"shard": s.shard_id, "tickers": len(s.tickers),
+                 "messages": s.messages, "rate": s.rate()}
+                for s in self.shards
+            ],
+            "bus": self.bus.stats(),
+        }
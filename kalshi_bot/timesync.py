@@ -0,0 +1,102 @@
+import time
+from collections import deque
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+
+from .indicators import RollingStats
+
+
+class ClockSync:
+    """
+    Estimates exchange clock offset (server - local, seconds) and round-trip time.
+
+    Every observation bounds the offset: a response stamped with server time S
+    (at `resolution`, e.g. 1 s for HTTP Date headers) was stamped somewhere
+    between our send and receive, so S - received <= offset < S + resolution - sent.
+    Intersecting the bounds of recent samples narrows the estimate well below
+    the header resolution. Only the last `window` samples count, so the
+    estimate follows drift; if they stop overlapping (local clock stepped),
+    the window is reset to the newest sample.
+    """
+
+    def __init__(self, window=64, latency_window=256):
+        self.bounds = deque(maxlen=window)  # (lo, hi)
+        self.rtt = RollingStats(latency_window)
+        self.latency = RollingStats(latency_window)  # one-way server->us, seconds
+        self.lo = None
+        self.hi = None
+
+    @property
+    def offset(self):
+        if self.lo is None:
+            return 0.0
+        if self.hi is None:
+            return self.lo
+        return (self.lo + self.hi) / 2
+
+    def uncertainty(self):
+        """Half-width of the offset bounds in seconds, None until bounded on both sides."""
+        if self.lo is None or self.hi is None:
+            return None
+        return (self.hi - self.lo) / 2
+
+    def now(self):
+        """Current time on the exchange clock (epoch seconds)."""
+        return time.time() + self.offset
+
+    def now_ms(self):
+        return int(self.now() * 1000)
+
+    def observe_response(self, sent, received, server_ts, resolution=1.0):
+        """Record a request/response pair timed with local time.time()."""
+        self.rtt.update(received - sent)
+        self._add(server_ts - received, server_ts + resolution - sent)
+
+    def observe_http(self, response, sent, received):
+        date = response.headers.get("Date")
+        if not date:
+            return
+        try:
+            server_ts = parsedate_to_datetime(date).timestamp()
+        except (TypeError, ValueError):
+            return
+        self.observe_response(sent, received, server_ts)
+
+    def observe_event(self, server_ts, received=None):
+        """
+        Record a pushed message stamped server_ts. A message can't arrive
+        before it was sent, which gives a lower bound on the offset; the
+        corrected one-way latency goes into self.latency.
+        """
+        received = time.time() if received is None else received
+        self._add(server_ts - received, None)
+        self.latency.update(max(0.0, received + self.offset - server_ts))
+
+    def _add(self, lo, hi):
+        self.bounds.append((lo, hi))
+        new_lo = max(b[0] for b in self.bounds)
+        his = [b[1] for b in self.bounds if b[1] is not None]
+        new_hi = min(his) if his else None
+        if new_hi is not None and new_lo > new_hi:
+            # inconsistent with history (clock stepped or drifted): start over
+            self.bounds.clear()
+            self.bounds.append((lo, hi))
+            new_lo, new_hi = lo, hi
+        self.lo, self.hi = new_lo, new_hi
+
+    def stats(self):
+        return {
+            "offset_ms": self.offset * 1000,
+            "uncertainty_ms": self.uncertainty() * 1000 if self.uncertainty() is not None else None,
+            "rtt_ms": self.rtt.mean * 1000 if self.rtt.mean is not None else None,
+            "latency_ms": self.latency.mean * 1000 if self.latency.mean is not None else None,
+        }
+
+
+def parse_ts(value):
+    """Exchange timestamps: ISO-8601 strings or epoch seconds -> epoch seconds."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
@@ -0,0 +1,79 @@
+from .data import depth_key, parse_orderbook
+
+
+def position_key(positions: dict, tickers) -> tuple:
+    """
+    Fingerprint of our positions in the given tickers. Resting order counts
+    are left out: our own quotes would otherwise wake the strategy again.
+    """
+    return tuple(sorted(
+        (p.get("ticker"), p.get("position"))
+        for p in positions.get("market_positions", positions.get("positions", []))
+        if p.get("ticker") in tickers
+    ))
+
+
+def fills_key(fills: dict) -> tuple:
+    """Fingerprint of the fill stream: count plus most recent trade ID."""
+    rows = fills.get("fills", [])
+    return (len(rows), rows[0].get("trade_id") if rows else None)
+
+
+class InputGate:
+    """
+    Decides whether a strategy needs to run this cycle.
+
+    Only the inputs the strategy subscribes to (Strategy.inputs) are
+    fingerprinted; if none of them changed since the last successful run the
+    call is skipped, so unchanged books don't re-emit the same quotes.
+    """
+
+    def __init__(self, inputs, tickers, depth_levels=None):
+        self.inputs = frozenset(inputs)
+        self.tickers = tuple(tickers)
+        self.depth_levels = depth_levels  # "depth" only looks at this many levels per side
+        self.last = None
+        self._pending = None
+        self.executed = 0
+        self.skipped = 0
+
+    def wants(self, name):
+        return name in self.inputs
+
+    def changed(self, books, positions=None, fills=None):
+        """
+        books: ticker -> orderbook for self.tickers. positions/fills only need
+        to be passed when the strategy subscribes to them.
+        """
+        key = []
+        if "top" in self.inputs:
+            key.append(tuple(parse_orderbook(books[t]) for t in self.tickers))
+        if "depth" in self.inputs:
+            key.append(tuple(depth_key(books[t], self.depth_levels) for t in self.tickers))
+        if "position" in self.inputs:
+            key.append(position_key(positions, self.tickers))
+        if "fills" in self.inputs:
+            key.append(fills_key(fills))
+        key = tuple(key)
+
+        if key == self.last:
+            self.skipped += 1
+            return False
+        self._pending = key
+        self.executed += 1
+        return True
+
+    def commit(self):
+        """
+        Mark the inputs from the last changed() call as handled. Call once
+        the strategy ran and its intents were submitted; if the strategy
+        raises first, the same inputs wake it again next cycle.
+        """
+        self.last = self._pending
+
+    def reset(self):
+        """Forget the last handled inputs so the next cycle always runs."""
+        self.last = None
+
+    def stats(self):
+        return {"executed": self.executed, "skipped": self.skipped}
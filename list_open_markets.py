@@ -1,23 +1,8 @@
-import os
 import json
-import uuid
-from dotenv import load_dotenv
-from cryptography.hazmat.primitives import serialization
-from kalshi_bot.client import KalshiHttpClient, Environment
+from kalshi_bot.config import make_http_client
 
-# Load .env
-load_dotenv()
-
-# Load private key
-with open("demo_private.pem", "rb") as f:
-    private_key = serialization.load_pem_private_key(f.read(), password=None)
-
-# Create client
-client = KalshiHttpClient(
-    key_id=os.getenv("KALSHI_API_KEY_ID"),
-    private_key=private_key,
-    environment=Environment.DEMO
-)
+# Create client from .env (KALSHI_API_KEY_ID, KALSHI_PRIVATE_KEY_PATH, KALSHI_ENV)
+client = make_http_client()
 
 print("Fetching open markets...\n")
 markets = client.get("/trade-api/v2/markets", params={"status": "open", "limit": 10})
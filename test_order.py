@@ -1,19 +1,9 @@
-import os
 import uuid
 import requests
-from kalshi_bot.client import KalshiHttpClient, Environment
-from cryptography.hazmat.primitives import serialization
+from kalshi_bot.config import make_http_client
 
-# Load private key from PEM file
-with open("demo_private.pem", "rb") as f:
-    private_key = serialization.load_pem_private_key(f.read(), password=None)
-
-# Create client
-client = KalshiHttpClient(
-    key_id=os.getenv("KALSHI_API_KEY_ID"),   # must be set in .env
-    private_key=private_key,
-    environment=Environment.DEMO
-)
+# Create client from .env (KALSHI_API_KEY_ID, KALSHI_PRIVATE_KEY_PATH, KALSHI_ENV)
+client = make_http_client()
 
 # Check balance
 print("Balance:", client.get_balance())